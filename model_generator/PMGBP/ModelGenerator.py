@@ -5,18 +5,56 @@ from .SBMLParser import SBMLParser
 from .ModelCodeWriter import ModelCodeWriter
 from .XMLParametersWriter import XMLParametersWriter
 from .constants import *
-from itertools import islice
+from itertools import count, islice
+import sys
 
 
 def chunks(data, SIZE=150):
-    it = iter(data)
-    for i in range(0, len(data), SIZE):
-        yield {k: data[k] for k in islice(it, SIZE)}
+    it = iter(data.items())
+    while True:
+        chunk = dict(islice(it, SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def plan_enzyme_set(cid, esn, enzyme_set, groups_size):
+    """
+    Separates an enzyme set in groups and builds the routing tables of the set and of each group.
+    It has no side effects, the routers and the model code are written by the ModelGenerator.
+
+    :param cid: The compartment id.
+    :param esn: The enzyme set name.
+    :param enzyme_set: The enzyme set parameters indexed by eid (enzyme ID).
+    :type enzyme_set: dict[str, dict[str, any]]
+    :param groups_size: The maximum amount of enzymes of each group.
+    :return: The enzyme ids of each group and the (router id, routing table) pairs of the routers.
+    :rtype: tuple[list[list[str]], list[tuple[str, dict[str, int]]]]
+    """
+
+    # Enzyme sets are separated in groups, this is because the C++ problem compiling large tuples
+    # Currently the maximum group amount is 150 and each group can hold 150 enzymes, thus, each compartment
+    # can have a maximum of 150 * 150 = 22500 enzymes.
+    groups_enzyme_ids = [list(group.keys()) for group in chunks(enzyme_set, SIZE=groups_size)]
+    routers = []
+    routing_table = {}
+
+    # Routers xml parameters
+    for port, group in enumerate(groups_enzyme_ids):
+        group_id = '_'.join([cid, esn, str(port)])
+        routing_table.update(dict.fromkeys(group, port))
+
+        group_routing_table = dict(zip(group, range(len(group))))
+        routers.append((group_id, group_routing_table))
+
+    routers.append(('_'.join([cid, esn]), routing_table))
+
+    return groups_enzyme_ids, routers
 
 
 class ModelStructure:
 
-    def __init__(self, cid, parser, membranes=None, external_enzyme_sets=None):
+    def __init__(self, cid, parser, membranes=None, external_enzyme_sets=None, species=None):
         """
         Defines the basic structure of a compartment. A compartment has at least one internal
         reaction set called the bulk (i.e. the compartment internal reactions).
@@ -27,6 +65,9 @@ class ModelStructure:
         :param external_enzyme_sets:  A dictionary of all the related external reaction sets
         grouped by their compartments. Optional.
         :type external_enzyme_sets: dict[str, list[str]]
+        :param species: The compartment species as returned by parser.parse_compartments_species()[cid].
+        Optional, it is retrieved from the parser if not specified.
+        :type species: dict[str, str]
         """
 
         if membranes is None:
@@ -35,15 +76,15 @@ class ModelStructure:
         if external_enzyme_sets is None:
             external_enzyme_sets = {}
 
-        self.id = cid
+        if species is None:
+            species = parser.parse_compartments_species()[cid]
+
+        self.id = sys.intern(cid)
         self.space = {}
         self.routing_table = {}
 
         # Compartment input-membrane mapping
-        port_numbers = range(len(membranes))
-        self.membrane_eic = {esn: port
-                             for esn, port
-                             in zip(membranes, port_numbers)}
+        self.membrane_eic = dict(zip(membranes, range(len(membranes))))
 
         # Building routing table, each reaction can be reached using the port
         # that the routing table indicates. Each port communicates the space with
@@ -55,16 +96,13 @@ class ModelStructure:
         # Initial ports are for IC (internal reaction sets)
         internal_enzyme_sets = [BULK] + membranes
         port_numbers = range(len(internal_enzyme_sets))
-        self.routing_table = {(self.id, esn): port
-                              for esn, port
-                              in zip(internal_enzyme_sets, port_numbers)}
+        self.routing_table = dict(zip(((self.id, esn) for esn in internal_enzyme_sets), port_numbers))
 
         # Final ports are for EOC (external reaction sets from other compartments)
-        port_number = len(self.routing_table)
-        for external_cid, reaction_sets in external_enzyme_sets.items():
-            for reaction_set in reaction_sets:
-                self.routing_table[(external_cid, reaction_set)] = port_number
-                port_number += 1
+        port_numbers = count(len(self.routing_table))
+        self.routing_table.update(((external_cid, reaction_set), next(port_numbers))
+                                  for external_cid, reaction_sets in external_enzyme_sets.items()
+                                  for reaction_set in reaction_sets)
 
         # Building enzyme sets
         self.enzyme_sets = {}
@@ -73,15 +111,14 @@ class ModelStructure:
  
         # Building space
         reaction_parameters = parser.get_related_reaction_parameters(cid)
-        metabolites = {specie: parser.metabolite_amounts[specie]
-                       for specie in list(parser.parse_compartments_species()[cid].keys())}
+        metabolites = {specie: parser.metabolite_amounts[specie] for specie in species}
         self.space_parameters = {
             'cid': cid,
             'interval_time': parser.interval_times[cid],
             'metabolites': metabolites,
             'reaction_parameters': reaction_parameters,
             'volume': parser.get_compartment_volume(cid),
-            'enzymes': parser.get_enzymes(list(reaction_parameters.keys()))
+            'enzymes': parser.get_enzymes(reaction_parameters.keys())
         }
 
 
@@ -146,53 +183,41 @@ class ModelGenerator:
 
         e_external_enzyme_sets = {periplasm_id: [OUTER, TRANS]}
 
+        all_species = self.parser.parse_compartments_species()
+
         # Compartment model structures
         self.periplasm = ModelStructure(periplasm_id,
                                         self.parser,
-                                        membranes=[OUTER, INNER, TRANS])
+                                        membranes=[OUTER, INNER, TRANS],
+                                        species=all_species[periplasm_id])
 
         self.extra_cellular = ModelStructure(extra_cellular_id,
                                              self.parser,
-                                             external_enzyme_sets=e_external_enzyme_sets)
+                                             external_enzyme_sets=e_external_enzyme_sets,
+                                             species=all_species[extra_cellular_id])
 
         self.cytoplasm = ModelStructure(cytoplasm_id,
                                         self.parser,
-                                        external_enzyme_sets=c_external_enzyme_sets)
+                                        external_enzyme_sets=c_external_enzyme_sets,
+                                        species=all_species[cytoplasm_id])
 
-        self.organelles = {comp_id: ModelStructure(comp_id, self.parser, [MEMBRANE])
+        self.organelles = {comp_id: ModelStructure(comp_id,
+                                                   self.parser,
+                                                   [MEMBRANE],
+                                                   species=all_species[comp_id])
                            for comp_id in self.parser.get_compartments()
                            if comp_id not in special_compartment_ids}
 
     def generate_enzyme_sets(self, compartment):
         cid = compartment.id
-        return {(cid, esn): self.generate_enzyme_set(cid, esn, enzyme_set)
+        return {esn: self.generate_enzyme_set(cid, esn, enzyme_set)
                 for esn, enzyme_set in compartment.enzyme_sets.items()}
 
     def generate_enzyme_set(self, cid, esn, enzyme_set):
-        enzyme_set_id = '_'.join([cid, esn])
-
-        # Enzyme sets are separated in groups, this is because the C++ problem compiling large tuples
-        # Currently the maximum group amount is 150 and each group can hold 150 enzymes, thus, each compartment
-        # can have a maximum of 150 * 150 = 22500 enzymes.
-        groups = chunks(enzyme_set, SIZE=self.groups_size)
-        groups_enzyme_ids = []
-        routing_table = {}
-        
-        # Routers xml parameters
-        port = 0
-        for group in groups:
-            enzyme_ids = list(group.keys())
-            groups_enzyme_ids.append(enzyme_ids)
-
-            group_id = '_'.join([cid, esn, str(port)])
-            routing_table.update({eid: port for eid in enzyme_ids})
-            port += 1
-
-            port_numbers = range(len(enzyme_ids))
-            group_routing_table = {eid: port_number for eid, port_number in zip(enzyme_ids, port_numbers)}
-            self.parameter_writer.add_router(group_id, group_routing_table)
+        groups_enzyme_ids, routers = plan_enzyme_set(cid, esn, enzyme_set, self.groups_size)
 
-        self.parameter_writer.add_router(enzyme_set_id, routing_table)
+        for router_id, routing_table in routers:
+            self.parameter_writer.add_router(router_id, routing_table)
 
         return self.coder.write_enzyme_set(cid, esn, groups_enzyme_ids)
 
@@ -211,20 +236,21 @@ class ModelGenerator:
                                                     PRODUCT_MESSAGE_TYPE,
                                                     REACTANT_MESSAGE_TYPE,
                                                     INFORMATION_MESSAGE_TYPE)
+        space_type = 'pmgbp::structs::' + space + '::' + space
 
         sub_models = [space] + [es_model_name for (es_model_name, _, _) in enzyme_sets.values()]
 
         ic = []
-        for es_address, port_number in compartment.routing_table.items():
+        for (es_cid, esn), port_number in compartment.routing_table.items():
             # Organelle spaces do not send metabolites to other compartments without passing through
             # their membranes, that is the assert.
-            assert es_address[0] == compartment.id
-            es_model_name = enzyme_sets[es_address][0]
-            ic += [
-                (space, 'pmgbp::structs::'+space+'::'+space, port_number, es_model_name, 'pmgbp::models::enzyme', 0),
-                (es_model_name, 'pmgbp::models::enzyme', "0_product", space, 'pmgbp::structs::'+space+'::'+space, "0_product"),
-                (es_model_name, 'pmgbp::models::enzyme', "0_information", space, 'pmgbp::structs::'+space+'::'+space, "0_information")
-            ]
+            assert es_cid == compartment.id
+            es_model_name = enzyme_sets[esn][0]
+            ic.extend((
+                (space, space_type, port_number, es_model_name, 'pmgbp::models::enzyme', 0),
+                (es_model_name, 'pmgbp::models::enzyme', "0_product", space, space_type, "0_product"),
+                (es_model_name, 'pmgbp::models::enzyme', "0_information", space, space_type, "0_information")
+            ))
 
         # If the output port amount is equal to 1, then the model only sends messages to the space
         # and there is no communication with the extra cellular space, thus, it must not be linked
@@ -236,17 +262,19 @@ class ModelGenerator:
         eoc = []
         for (es_model_name, _, output_port_amount) in enzyme_sets.values():
             for port_number in range(1, output_port_amount):
-                eoc.append((es_model_name, 'pmgbp::models::enzyme', str(port_number) + "_product", str(port_number) + "_product"))
-                eoc.append((es_model_name, 'pmgbp::models::enzyme', str(port_number) + "_information", str(port_number) + "_information"))
+                product_port = str(port_number) + "_product"
+                information_port = str(port_number) + "_information"
+                eoc.append((es_model_name, 'pmgbp::models::enzyme', product_port, product_port))
+                eoc.append((es_model_name, 'pmgbp::models::enzyme', information_port, information_port))
                 if port_number not in out_port_numbers:
                     out_port_numbers.append(port_number)
-                    out_ports.append((str(port_number) + "_product", PRODUCT_MESSAGE_TYPE, 'out'))
-                    out_ports.append((str(port_number) + "_information", INFORMATION_MESSAGE_TYPE, 'out'))
+                    out_ports.append((product_port, PRODUCT_MESSAGE_TYPE, 'out'))
+                    out_ports.append((information_port, INFORMATION_MESSAGE_TYPE, 'out'))
 
         in_ports = []
         eic = []
         for es_name, port_number in compartment.membrane_eic.items():
-            es_model_name = enzyme_sets[(compartment.id, es_name)][0]
+            es_model_name = enzyme_sets[es_name][0]
             eic.append((es_model_name, 'pmgbp::models::enzyme', 0, port_number))
             in_ports.append((port_number, REACTANT_MESSAGE_TYPE, 'in'))
             # TODO: Check if this link shouldn't be removed
@@ -266,7 +294,7 @@ class ModelGenerator:
         enzyme_sets = self.generate_enzyme_sets(compartment)
         assert len(enzyme_sets) == 1  # bulk compartments have no membranes
 
-        bulk = enzyme_sets[(cid, BULK)][0]
+        bulk = enzyme_sets[BULK][0]
 
         self.parameter_writer.add_space(cid, compartment.space_parameters, compartment.routing_table)
 
@@ -279,21 +307,22 @@ class ModelGenerator:
                                                     PRODUCT_MESSAGE_TYPE,
                                                     REACTANT_MESSAGE_TYPE,
                                                     INFORMATION_MESSAGE_TYPE)
+        space_type = 'pmgbp::structs::' + space + '::' + space
 
         sub_models = [space, bulk]
 
         bulk_port_number = compartment.routing_table[(cid, BULK)]
         ic = [
-            (space, 'pmgbp::structs::'+space+'::'+space, bulk_port_number, bulk, 'pmgbp::models::enzyme', 0), 
-            (bulk, 'pmgbp::models::enzyme', "0_product", space, 'pmgbp::structs::'+space+'::'+space, "0_product"),
-            (bulk, 'pmgbp::models::enzyme', "0_information", space, 'pmgbp::structs::'+space+'::'+space, "0_information")
+            (space, space_type, bulk_port_number, bulk, 'pmgbp::models::enzyme', 0), 
+            (bulk, 'pmgbp::models::enzyme', "0_product", space, space_type, "0_product"),
+            (bulk, 'pmgbp::models::enzyme', "0_information", space, space_type, "0_information")
         ]
 
         out_ports = []
         eoc = []
         for (es_cid, _), port_number in compartment.routing_table.items():
             if es_cid != cid:
-                eoc.append((space, 'pmgbp::structs::'+space+'::'+space, port_number, port_number))
+                eoc.append((space, space_type, port_number, port_number))
                 out_ports.append((port_number, REACTANT_MESSAGE_TYPE, 'out'))
 
         in_ports = [
@@ -302,8 +331,8 @@ class ModelGenerator:
         ]
 
         eic = [
-            (space, 'pmgbp::structs::'+space+'::'+space, "0_product", "0_product"),
-            (space, 'pmgbp::structs::'+space+'::'+space, "0_information", "0_information")
+            (space, space_type, "0_product", "0_product"),
+            (space, space_type, "0_information", "0_information")
         ]
 
         return self.coder.write_coupled_model(cid,
@@ -336,44 +365,47 @@ class ModelGenerator:
             sub_models.append(organelle_models[cid][0])  # append model name
 
         ic = self.generate_top_bulk_ic(cytoplasm_model,
-                                       self.cytoplasm.id,
-                                       self.cytoplasm.routing_table,
+                                       self.cytoplasm,
                                        periplasm_model)
 
-        ic += self.generate_top_bulk_ic(extra_cellular_model,
-                                        self.extra_cellular.id,
-                                        self.extra_cellular.routing_table,
-                                        periplasm_model)
+        ic.extend(self.generate_top_bulk_ic(extra_cellular_model,
+                                            self.extra_cellular,
+                                            periplasm_model))
 
         for cid, (model_name, _, output_port_amount) in organelle_models.items():
             for esn, es_port_number in self.organelles[cid].membrane_eic.items():
                 c_port_number = self.cytoplasm.routing_table[(cid, esn)]
-                ic.append((cytoplasm_model, c_port_number, model_name, es_port_number))
-                # *1) organelle output port 1 always goes to cytoplasm
-                ic.append((model_name, model_name, "1_product", cytoplasm_model, cytoplasm_model, "0_product"))
-                ic.append((model_name, model_name, "1_information", cytoplasm_model, cytoplasm_model, "0_information"))
+                ic.extend((
+                    (cytoplasm_model, c_port_number, model_name, es_port_number),
+                    # *1) organelle output port 1 always goes to cytoplasm
+                    (model_name, model_name, "1_product", cytoplasm_model, cytoplasm_model, "0_product"),
+                    (model_name, model_name, "1_information", cytoplasm_model, cytoplasm_model, "0_information")
+                ))
 
                 if output_port_amount > 1:
                     e_port_number = self.cytoplasm.routing_table[(cid, esn)]
-                    ic.append((extra_cellular_model, extra_cellular_model, e_port_number, model_name, model_name, es_port_number))
-                    # *1) organelle output port 2 always goes to extracellular
-                    ic.append((model_name, model_name, "2_product", extra_cellular_model, extra_cellular_model, "0_product"))
-                    ic.append((model_name, model_name, "2_information", extra_cellular_model, extra_cellular_model, "0_information"))
+                    ic.extend((
+                        (extra_cellular_model, extra_cellular_model, e_port_number, model_name, model_name, es_port_number),
+                        # *1) organelle output port 2 always goes to extracellular
+                        (model_name, model_name, "2_product", extra_cellular_model, extra_cellular_model, "0_product"),
+                        (model_name, model_name, "2_information", extra_cellular_model, extra_cellular_model, "0_information")
+                    ))
 
         self.parameter_writer.save_xml()
         cell_coupled = self.coder.write_coupled_model(top, sub_models, [], [], [], ic)
 
         return cell_coupled
 
-    def generate_top_bulk_ic(self, bulk_model, bulk_cid, bulk_routing_table, periplasm_model):
+    def generate_top_bulk_ic(self, bulk_model, bulk, periplasm_model):
         ic = []
+        bulk_cid = bulk.id
 
         # this is the same logic as *1)
         periplasm_oport_number = 1 if bulk_cid == self.cytoplasm.id else 2
         ic.append((periplasm_model, periplasm_model, str(periplasm_oport_number) + "_product", bulk_model, bulk_model, "0_product"))
         ic.append((periplasm_model, periplasm_model, str(periplasm_oport_number) + "_information", bulk_model, bulk_model, "0_information"))
 
-        for (cid, esn), c_port_number in bulk_routing_table.items():
+        for (cid, esn), c_port_number in bulk.routing_table.items():
             if cid == bulk_cid:
                 continue
 
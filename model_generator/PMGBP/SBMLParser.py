@@ -8,6 +8,7 @@ python SBML parser: https://github.com/linsalrob/PyFBA/blob/master/PyFBA/parse/S
 
 import json
 import re
+import sys
 from bs4 import BeautifulSoup  # sudo pip install beautifulsoup, lxml
 from collections import defaultdict
 from .constants import *
@@ -55,8 +56,8 @@ class Location:
         :param esn: Te reaction set name
         :type esn: str
         """
-        self.cid = cid
-        self.esn = esn
+        self.cid = sys.intern(cid)
+        self.esn = sys.intern(esn)
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -159,6 +160,14 @@ class SBMLParser:
             cid = self.reactions[key]['location']['cid']
             rsn = self.reactions[key]['location']['esn']
             self.reactions[key]['location'] = Location(cid, rsn)
+            self.reactions[key]['species'] = list(map(sys.intern, self.reactions[key]['species']))
+
+        for key in list(self.enzymes.keys()):
+            self.enzymes[key]['handled_reactions'] = list(map(sys.intern, self.enzymes[key]['handled_reactions']))
+
+        # IDs are used as dictionary keys all along the model generation
+        self.reactions = {sys.intern(rid): parameters for rid, parameters in self.reactions.items()}
+        self.enzymes = {sys.intern(eid): parameters for eid, parameters in self.enzymes.items()}
 
     def load_sbml_file(self, sbml_file):
         """
@@ -181,7 +190,7 @@ class SBMLParser:
 
         self.compartments = {}
         for compartment in self.model.findAll('compartment'):
-            self.compartments[compartment.get('id')] = compartment.get('name')
+            self.compartments[sys.intern(compartment.get('id'))] = compartment.get('name')
 
         return self.compartments
 
@@ -197,8 +206,8 @@ class SBMLParser:
         self.compartment_species = {k: {} for k in list(self.get_compartments().keys())}
 
         for specie in self.model.findAll('species'):
-            sid = specie.get('id')
-            cid = specie.get('compartment')
+            sid = sys.intern(specie.get('id'))
+            cid = sys.intern(specie.get('compartment'))
             name = specie.get('name')
 
             self.compartment_species[cid][sid] = name
@@ -228,20 +237,20 @@ class SBMLParser:
         least one of the reactions is added.
         :rtype: dict[str, dict[str, any]]
         """
+        reactions = set(reactions)
         return {eid: enzyme_parameters
                 for eid, enzyme_parameters in self.enzymes.items()
-                if not_empty_intersection(enzyme_parameters['handled_reactions'], reactions)}
+                if not reactions.isdisjoint(enzyme_parameters['handled_reactions'])}
 
     def get_enzyme_set(self, cid, esn):
         location = Location(cid, esn)
 
-        return {eid: parameters 
-                for eid, parameters 
-                in self.enzymes.items() 
-                if any([self.reactions[rid]['location'] == location 
-                        for rid 
-                        in parameters['handled_reactions']
-                        ])
+        return {eid: parameters
+                for eid, parameters
+                in self.enzymes.items()
+                if any(self.reactions[rid]['location'] == location
+                       for rid
+                       in parameters['handled_reactions'])
                 }
 
     def get_eids(self, reaction):
@@ -341,7 +350,7 @@ class SBMLParser:
         if self.is_biomass(rid) is True:
             return
 
-        for eid in self.get_eids(reaction):
+        for eid in map(sys.intern, self.get_eids(reaction)):
             if eid not in list(self.enzymes.keys()):
                 self.enzymes[eid] = {
                     'id': eid,
@@ -376,7 +385,7 @@ class SBMLParser:
         :return: The cid (Compartment ID) from where the specie id passed as parameter belongs
         """
 
-        return self.model.find('species', {'id': sid}).get('compartment')
+        return sys.intern(self.model.find('species', {'id': sid}).get('compartment'))
 
     def get_reaction_routing_table(self, reaction, cid):
         """
@@ -388,7 +397,7 @@ class SBMLParser:
         :rtype: dict[str, int]
         """
 
-        species = [s.get('species') for s in reaction.findAll('speciesReference')]
+        species = [sys.intern(s.get('species')) for s in reaction.findAll('speciesReference')]
         return {s: 0 if cid == self.get_compartment(s)
                 else 1 if self.cytoplasm_id == self.get_compartment(s)
                 else 2 for s in species}
@@ -442,7 +451,7 @@ class SBMLParser:
         :type: bs4.element.Tag.
         """
 
-        rid = reaction.get('id')
+        rid = sys.intern(reaction.get('id'))
         if self.is_biomass(rid) is True:
             return
 
@@ -502,7 +511,7 @@ class SBMLParser:
         stoichiometries = reaction.find('listOfReactants')
         if stoichiometries is not None:
             reactants = {
-                s.get('species'): 1.0
+                sys.intern(s.get('species')): 1.0
                 if s.get('stoichiometry') is None
                 else float(s.get('stoichiometry'))
                 for s in stoichiometries.findAll('speciesReference')
@@ -514,7 +523,7 @@ class SBMLParser:
         stoichiometries = reaction.find('listOfProducts')
         if stoichiometries is not None:
             products = {
-                s.get('species'): 1.0
+                sys.intern(s.get('species')): 1.0
                 if s.get('stoichiometry') is None
                 else float(s.get('stoichiometry'))
                 for s in stoichiometries.findAll('speciesReference')
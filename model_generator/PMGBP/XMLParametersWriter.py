@@ -4,12 +4,15 @@
 from lxml import etree
 import os
 
+# Output buffer size, the whole parameters tree is serialized in a single save_xml call
+XML_BUFFER_SIZE = 1 << 20
+
 
 class XMLParametersWriter:
 
     def __init__(self, model_dir='..', xml_file='parameters'):
 
-        self.xml_file = open(model_dir + os.sep + xml_file + '.xml', 'wb')
+        self.xml_file = open(model_dir + os.sep + xml_file + '.xml', 'wb', buffering=XML_BUFFER_SIZE)
         self.xml_file_path = self.xml_file.name
 
         self.parameters = etree.Element('parameters')
@@ -171,7 +174,8 @@ class XMLParametersWriter:
         print(etree.tostring(self.parameters, encoding='UTF-8', pretty_print=True))
 
     def save_xml(self):
-        self.xml_file.write(etree.tostring(self.parameters, encoding='UTF-8', pretty_print=True))
+        # Serialize straight into the buffered file instead of building the whole document in memory
+        etree.ElementTree(self.parameters).write(self.xml_file, encoding='UTF-8', pretty_print=True)
         self.xml_file.flush()
 
     @staticmethod
@@ -1,5 +1,6 @@
 import unittest
-from SBMLParser import SBMLParser
+from PMGBP.SBMLParser import SBMLParser
+from PMGBP.ModelGenerator import plan_enzyme_set
 
 
 class TestSBMLParser(unittest.TestCase):
@@ -27,5 +28,33 @@ class TestSBMLParser(unittest.TestCase):
         self.assertEqual(self.sbml_parser.parse_gene_association(['(b1 or b2 or b3 or b4)']), ['b1', 'b2', 'b3', 'b4'])
 
 
+class TestPlanEnzymeSet(unittest.TestCase):
+
+    def test_groups(self):
+        groups, _ = plan_enzyme_set('c', 'bulk', dict.fromkeys(['e1', 'e2', 'e3', 'e4', 'e5']), 2)
+        self.assertEqual(groups, [['e1', 'e2'], ['e3', 'e4'], ['e5']])
+
+        groups, _ = plan_enzyme_set('c', 'bulk', dict.fromkeys(['e1', 'e2']), 2)
+        self.assertEqual(groups, [['e1', 'e2']])
+
+        groups, routers = plan_enzyme_set('c', 'bulk', {}, 2)
+        self.assertEqual(groups, [])
+        self.assertEqual(routers, [('c_bulk', {})])
+
+    def test_routers(self):
+        _, routers = plan_enzyme_set('c', 'bulk', dict.fromkeys(['e1', 'e2', 'e3', 'e4', 'e5']), 2)
+
+        # group routers map each enzyme to its position in the group
+        self.assertEqual(routers[:3], [
+            ('c_bulk_0', {'e1': 0, 'e2': 1}),
+            ('c_bulk_1', {'e3': 0, 'e4': 1}),
+            ('c_bulk_2', {'e5': 0})
+        ])
+
+        # the enzyme set router maps each enzyme to its group, it is always the last router
+        self.assertEqual(routers[3], ('c_bulk', {'e1': 0, 'e2': 0, 'e3': 1, 'e4': 1, 'e5': 2}))
+        self.assertEqual(len(routers), 4)
+
+
 if __name__ == '__main__':
     unittest.main()